@@ -18,27 +18,44 @@ from drf_spectacular.views import (
     SpectacularRedocView
 )
 
-urlpatterns = [
-    # Django admin panel
-    path('admin/', admin.site.urls),
+# --- JWT Authentication endpoints (mounted at api/token/) ---
+token_patterns = [
+    path('', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+]
+
+# --- drf-spectacular schema and documentation URLs (mounted at api/) ---
+docs_patterns = [
+    path('schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path("swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-alt"),
+    path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+]
 
+# Everything under api/ is grouped in one include() so the resolver matches the
+# prefix once and skips the whole subtree for non-API requests.
+api_patterns = [
     # --- Your main API endpoints ---
-    path('api/', include('listings.urls')),
+    path('', include('listings.urls')),
+    path('token/', include(token_patterns)),
+    path('', include(docs_patterns)),
+]
 
-    # --- JWT Authentication endpoints ---
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+urlpatterns = [
+    # Django admin panel
+    path('admin/', admin.site.urls),
 
-    # --- drf-spectacular schema and documentation URLs ---
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path("api/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-alt"),
+    path('api/', include(api_patterns)),
     path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-root"),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
 
 # ONLY SERVE STATIC FILES THIS WAY IN DEVELOPMENT (DEBUG=TRUE)
+# Production urlpatterns stay free of these entries. Each helper is only added when
+# its root is configured: MEDIA_URL otherwise resolves to '/', and static() would
+# append a catch-all pattern that every unmatched request has to walk through.
 if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    # If you also have MEDIA_ROOT for user-uploaded files, add this too:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    if settings.STATIC_ROOT:
+        urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    # If you also have MEDIA_ROOT for user-uploaded files, this serves it too:
+    if settings.MEDIA_ROOT:
+        urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
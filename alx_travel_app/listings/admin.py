@@ -1,3 +1,37 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Booking, Payment, Review, Message
+
+
+class WithRelatedAdmin(admin.ModelAdmin):
+    """
+    Lists objects through the model's `with_related` manager, which joins the
+    relations __str__ reads, so the changelist doesn't query once per row.
+    """
+
+    def get_queryset(self, request):
+        queryset = self.model.with_related.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+
+@admin.register(Booking)
+class BookingAdmin(WithRelatedAdmin):
+    list_filter = ('status',)
+
+
+@admin.register(Payment)
+class PaymentAdmin(WithRelatedAdmin):
+    list_filter = ('status', 'payment_method')
+
+
+@admin.register(Review)
+class ReviewAdmin(WithRelatedAdmin):
+    list_filter = ('rating',)
+
+
+@admin.register(Message)
+class MessageAdmin(WithRelatedAdmin):
+    pass
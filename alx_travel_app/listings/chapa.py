@@ -0,0 +1,49 @@
+# alx_travel_app/listings/chapa.py
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+
+# --- Chapa API Endpoints (Constants) ---
+CHAPA_INITIATE_URL = "https://api.chapa.co/v1/initialize"
+CHAPA_VERIFY_URL = "https://api.chapa.co/v1/verify/" # Note: takes a transaction_id after the slash
+CHAPA_TIMEOUT = (3.05, 10) # (connect, read) seconds
+CHAPA_TX_STATUS_TIMEOUT = 3600 # seconds a terminal payment status stays cached
+CHAPA_CHECKOUT_REUSE_WINDOW = timedelta(minutes=30) # pending checkouts newer than this are reused
+CHAPA_INITIATION_TIMEOUT = timedelta(minutes=1) # pending rows still without a checkout URL after this were abandoned
+CHAPA_VERIFY_CLAIM_TTL = timedelta(minutes=2) # outlasts a verify call with its timeouts and retries
+
+# Fixed parts of the initiate payload; the view adds the per-payment fields.
+CHAPA_PAYLOAD_TEMPLATE = {
+    "currency": "ETB", # Or dynamic if you support other currencies
+}
+CHAPA_CUSTOMIZATION_TITLE = "Travel Booking Payment"
+
+
+def tx_status_cache_key(tx_ref):
+    """Cache key for the final status of a Chapa transaction."""
+    return f"chapa:tx:{tx_ref}"
+
+
+def build_chapa_session():
+    """
+    Returns a requests Session for the Chapa API. Reusing one session keeps TCP/TLS
+    connections to api.chapa.co alive across payments instead of handshaking on every
+    call. Transient gateway errors are retried; urllib3 doesn't retry POSTs by default,
+    so initiation is never sent twice.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries))
+    session.headers.update({
+        "Authorization": f"Bearer {settings.CHAPA_SECRET_KEY}",
+        "Content-Type": "application/json"
+    })
+    return session
+
+
+# Shared by the payment views and the Celery verification task.
+CHAPA_SESSION = build_chapa_session()
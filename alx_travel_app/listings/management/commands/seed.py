@@ -1,14 +1,34 @@
 # listings/management/commands/seed.py
 
-import random, decimal
+import os, random, decimal, uuid
+from functools import lru_cache
 from datetime import timedelta
 from django.utils import timezone
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from faker import Faker
 from ...models import User, Property, Booking, Payment, Review, Message
 
 fake = Faker()
 
+SEED_PASSWORD = 'password123'
+
+# Nightly prices to draw from, built once instead of a Decimal per property.
+PRICES = [decimal.Decimal(x) for x in range(100, 1001)]
+
+
+@lru_cache(maxsize=None)
+def seed_password_hash():
+    """Hash SEED_PASSWORD once per process; the hasher is deliberately slow."""
+    return make_password(SEED_PASSWORD)
+
+
+def uuid_batch(n):
+    """Return n random UUID4s drawn from a single os.urandom() call."""
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
+
 
 class Command(BaseCommand):
     help = 'Seed the database with fake data for testing'
@@ -19,114 +39,194 @@ class Command(BaseCommand):
         parser.add_argument('--properties', type=int, default=3, help='Number of properties per host.')
         parser.add_argument('--bookings', type=int, default=2, help='Bookings per guest.')
         parser.add_argument('--messages', type=int, default=20, help='Total messages to generate.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, so repeated runs produce the same data.')
 
     def handle(self, *args, **opts):
-        if opts['clear']:
-            self.stdout.write(self.style.WARNING("Clearing all seed data..."))
-            Message.objects.all().delete()
-            Review.objects.all().delete()
-            Payment.objects.all().delete()
-            Booking.objects.all().delete()
-            Property.objects.all().delete()
-            User.objects.filter(is_superuser=False).delete()
-
-        self.seed_users(opts['users'])
-        self.seed_properties(opts['properties'])
-        self.seed_bookings(opts['bookings'])
-        self.seed_messages(opts['messages'])
+        Faker.seed(opts['seed'])
+        random.seed(opts['seed'])
+
+        # One transaction for the whole run: a single commit instead of one per row,
+        # and a failed seed leaves the database untouched.
+        with transaction.atomic():
+            if opts['clear']:
+                self.clear_data()
+
+            self.seed_users(opts['users'])
+            self.seed_properties(opts['properties'])
+            self.seed_bookings(opts['bookings'])
+            self.seed_messages(opts['messages'])
 
         self.stdout.write(self.style.SUCCESS("Database seeded successfully."))
 
+    def clear_data(self):
+        self.stdout.write(self.style.WARNING("Clearing all seed data..."))
+        seeded_models = [Message, Review, Payment, Booking, Property]
+        if connection.vendor == 'postgresql':
+            # TRUNCATE empties the tables in one statement without loading rows
+            # into Python for cascade/signal handling.
+            tables = ', '.join(connection.ops.quote_name(m._meta.db_table) for m in seeded_models)
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE TABLE {tables} CASCADE')
+        else:
+            for model in seeded_models:
+                model.objects.all().delete()
+        # Users are deleted rather than truncated so superusers survive a reset.
+        User.objects.filter(is_superuser=False).delete()
+
     def seed_users(self, count):
         roles = [User.RoleChoices.GUEST, User.RoleChoices.HOST]
-        for _ in range(count):
-            role = random.choice(roles)
-            user = User.objects.create_user(
-                email=fake.unique.email(),
-                username=fake.user_name(),
-                password='password123',
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                phone_number=fake.phone_number(),
+        hashed_password = seed_password_hash()
+        # Emails and usernames are unique, so derive them from an index rather than
+        # paying for Faker's unique-value tracking. Offset past earlier seed runs.
+        start = User.objects.filter(email__startswith='seed_user_').count()
+        indexes = range(start, start + count)
+        emails = [f"seed_user_{i}@example.com" for i in indexes]
+        usernames = [f"seed_user_{i}" for i in indexes]
+        # Generate the fake columns up front so object construction below is a plain zip.
+        first_names = [fake.first_name() for _ in range(count)]
+        last_names = [fake.last_name() for _ in range(count)]
+        phone_numbers = [fake.phone_number() for _ in range(count)]
+        user_roles = random.choices(roles, k=count)
+        users = [
+            User(
+                user_id=user_id,
+                email=email,
+                username=username,
+                password=hashed_password,
+                first_name=first_name,
+                last_name=last_name,
+                phone_number=phone_number,
                 role=role,
+                is_staff=(role == User.RoleChoices.HOST),
             )
-            if role == User.RoleChoices.HOST:
-                user.is_staff = True
-                user.save()
+            for user_id, email, username, first_name, last_name, phone_number, role in zip(
+                uuid_batch(count), emails, usernames, first_names, last_names, phone_numbers, user_roles
+            )
+        ]
+        User.objects.bulk_create(users, batch_size=500)
         self.stdout.write(self.style.SUCCESS(f"Created {count} users."))
 
     def seed_properties(self, count_per_host):
-        hosts = User.objects.filter(role=User.RoleChoices.HOST)
-        total = 0
-        for host in hosts:
-            for _ in range(count_per_host):
-                Property.objects.create(
-                    host=host,
-                    name=fake.catch_phrase(),
-                    description=fake.text(200),
-                    location=fake.address(),
-                    price_per_night=decimal.Decimal(random.randint(100, 1000)),
-                )
-                total += 1
-        self.stdout.write(self.style.SUCCESS(f"Created {total} properties."))
+        hosts = list(User.objects.filter(role=User.RoleChoices.HOST).only('user_id'))
+        total = len(hosts) * count_per_host
+        property_hosts = [host for host in hosts for _ in range(count_per_host)]
+        names = [fake.catch_phrase() for _ in range(total)]
+        descriptions = [fake.text(200) for _ in range(total)]
+        locations = [fake.address() for _ in range(total)]
+        prices = random.choices(PRICES, k=total)
+        properties = [
+            Property(
+                property_id=property_id,
+                host=host,
+                name=name,
+                description=description,
+                location=location,
+                price_per_night=price,
+            )
+            for property_id, host, name, description, location, price in zip(
+                uuid_batch(total), property_hosts, names, descriptions, locations, prices
+            )
+        ]
+        Property.objects.bulk_create(properties, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f"Created {len(properties)} properties."))
 
     def seed_bookings(self, max_per_guest):
-        guests = User.objects.filter(role=User.RoleChoices.GUEST)
-        properties = list(Property.objects.all())
-        booking_count = 0
-        payment_count = 0
-
-        for guest in guests:
-            for _ in range(random.randint(1, max_per_guest)):
-                prop = random.choice(properties)
-                start = fake.date_between(start_date='-30d', end_date='+30d')
+        # Only keys and prices are needed here, so skip hydrating full model rows.
+        guest_ids = list(User.objects.filter(role=User.RoleChoices.GUEST).values_list('user_id', flat=True))
+        properties = list(Property.objects.values_list('property_id', 'price_per_night'))
+        bookings, payments, reviews = [], [], []
+        reviewed = set()  # (property, guest) pairs; Review is unique_together on them
+        bookings_per_guest = [random.randint(1, max_per_guest) for _ in guest_ids]
+        booking_ids = iter(uuid_batch(sum(bookings_per_guest)))
+        today = timezone.now().date()
+
+        for guest_id, guest_booking_count in zip(guest_ids, bookings_per_guest):
+            for _ in range(guest_booking_count):
+                property_id, price_per_night = random.choice(properties)
+                start = today + timedelta(days=random.randint(-30, 30))
                 end = start + timedelta(days=random.randint(1, 7))
-                price = prop.price_per_night * (end - start).days
+                price = price_per_night * (end - start).days
                 status = random.choice(Booking.BookingStatusChoices.values)
 
-                booking = Booking.objects.create(
-                    property=prop,
-                    user=guest,
+                # booking_id is generated client-side, so child rows can reference
+                # the booking before it is inserted.
+                booking = Booking(
+                    booking_id=next(booking_ids),
+                    property_id=property_id,
+                    user_id=guest_id,
                     start_date=start,
                     end_date=end,
                     total_price=price,
                     status=status,
                 )
-                booking_count += 1
+                bookings.append(booking)
 
                 if status == Booking.BookingStatusChoices.CONFIRMED:
-                    Payment.objects.create(
+                    payments.append(Payment(
                         booking=booking,
                         amount=price,
                         payment_method=random.choice(Payment.PaymentMethodChoices.values),
-                    )
-                    payment_count += 1
+                    ))
 
                 # Review for confirmed and past
-                if status == Booking.BookingStatusChoices.CONFIRMED and end < timezone.now().date():
-                    Review.objects.create(
-                        property=prop,
-                        user=guest,
+                if (status == Booking.BookingStatusChoices.CONFIRMED and end < today
+                        and (property_id, guest_id) not in reviewed):
+                    reviewed.add((property_id, guest_id))
+                    reviews.append(Review(
+                        property_id=property_id,
+                        user_id=guest_id,
                         rating=random.randint(1, 5),
                         comment=fake.sentence()
-                    )
+                    ))
 
-        self.stdout.write(self.style.SUCCESS(f"Created {booking_count} bookings."))
-        self.stdout.write(self.style.SUCCESS(f"Created {payment_count} payments and related reviews."))
+        self.insert_bookings(bookings)
+        Payment.objects.bulk_create(payments, batch_size=1000)
+        Review.objects.bulk_create(reviews, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {len(bookings)} bookings."))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(payments)} payments and {len(reviews)} related reviews."
+        ))
+
+    def insert_bookings(self, bookings):
+        if connection.vendor != 'postgresql':
+            Booking.objects.bulk_create(bookings, batch_size=1000)
+            return
+        # Bookings are the largest seeded table; stream them with COPY (psycopg 3)
+        # instead of multi-row INSERTs. COPY bypasses model pre_save, so the
+        # auto_now_add created_at has to be supplied explicitly.
+        now = timezone.now()
+        columns = ['booking_id', 'property_id', 'user_id', 'start_date',
+                   'end_date', 'total_price', 'status', 'created_at']
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(Booking._meta.db_table),
+            ', '.join(connection.ops.quote_name(c) for c in columns),
+        )
+        with connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for b in bookings:
+                    copy.write_row((b.booking_id, b.property_id, b.user_id, b.start_date,
+                                    b.end_date, b.total_price, b.status, now))
 
     def seed_messages(self, count):
-        users = list(User.objects.exclude(role=User.RoleChoices.ADMIN))
-        if len(users) < 2:
+        user_ids = list(User.objects.exclude(role=User.RoleChoices.ADMIN).values_list('user_id', flat=True))
+        if len(user_ids) < 2:
             self.stdout.write(self.style.WARNING("Not enough users to send messages."))
             return
 
-        for _ in range(count):
-            sender = random.choice(users)
-            recipient = random.choice([u for u in users if u != sender])
-            Message.objects.create(
-                sender=sender,
-                recipient=recipient,
-                message_body=fake.sentence()
-            )
+        bodies = [fake.sentence() for _ in range(count)]
+        messages = []
+        user_count = len(user_ids)
+        for message_id, body in zip(uuid_batch(count), bodies):
+            # Offsetting the sender index by 1..U-1 (mod U) always yields a distinct recipient.
+            i = random.randrange(user_count)
+            j = (i + random.randrange(1, user_count)) % user_count
+            messages.append(Message(
+                message_id=message_id,
+                sender_id=user_ids[i],
+                recipient_id=user_ids[j],
+                message_body=body
+            ))
+        Message.objects.bulk_create(messages, batch_size=1000)
 
         self.stdout.write(self.style.SUCCESS(f"Created {count} messages."))
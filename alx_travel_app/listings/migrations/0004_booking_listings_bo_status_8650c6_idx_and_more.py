@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_payment_chapa_status_text_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status'], name='listings_bo_status_8650c6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['property', 'start_date', 'end_date'], name='booking_prop_dates_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='listings_bo_propert_eeae8e_idx',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_booking_listings_bo_status_8650c6_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['booking', 'payment_date'], name='payment_pending_date_idx'),
+        ),
+    ]
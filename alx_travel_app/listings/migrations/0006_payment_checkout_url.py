@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0005_payment_payment_pending_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='checkout_url',
+            field=models.URLField(blank=True, help_text='Chapa checkout page URL returned at payment initiation.', max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_payment_checkout_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='verification_claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker last claimed this payment for Chapa verification.', null=True),
+        ),
+    ]
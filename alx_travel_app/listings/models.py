@@ -37,6 +37,45 @@ class UserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
+class BookingManager(models.Manager):
+    """
+    Joins the property and guest that __str__ reads, so iterating bookings (admin,
+    shell) doesn't issue a query per row. Exposed as `Booking.with_related`; the
+    default `objects` manager stays plain so `.only()`/`.defer()` work unchanged.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('property', 'user')
+
+
+class PaymentManager(models.Manager):
+    """
+    Joins the related booking read by __str__. Exposed as `Payment.with_related`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('booking')
+
+
+class ReviewManager(models.Manager):
+    """
+    Joins the reviewed property and its author. Exposed as `Review.with_related`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('property', 'user')
+
+
+class MessageManager(models.Manager):
+    """
+    Joins sender and recipient. Exposed as `Message.with_related`. The parent message
+    isn't joined: __str__ only reads parent_message_id from the row itself.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('sender', 'recipient')
+
+
 # --- User Model ---
 # Extending Django's AbstractUser to match the provided specification.
 class User(AbstractUser):
@@ -155,13 +194,19 @@ class Booking(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = models.Manager()
+    with_related = BookingManager()  # Pre-joined for __str__; see BookingManager
+
     class Meta:
         verbose_name = "Booking"
         verbose_name_plural = "Bookings"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['property']),  # Additional index on property
             models.Index(fields=['user']),  # Additional index on user
+            models.Index(fields=['status']),  # For filtering bookings by status (e.g. confirmed)
+            # For availability/date-range queries; property is the leftmost column, so this
+            # also serves lookups by property alone.
+            models.Index(fields=['property', 'start_date', 'end_date'], name='booking_prop_dates_idx'),
         ]
         # Consider adding a unique_together constraint or custom validation
         # to prevent overlapping bookings for the same property.
@@ -215,6 +260,21 @@ class Payment(models.Model):
         help_text="Chapa's payment status as reported by Chapa."
     )
 
+    # Chapa's hosted checkout page, returned again if the user retries initiation
+    checkout_url = models.URLField(
+        max_length=500,
+        blank=True,
+        null=True,
+        help_text="Chapa checkout page URL returned at payment initiation."
+    )
+
+    # Set when a verification worker claims this payment; a stale claim can be retaken
+    verification_claimed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When a worker last claimed this payment for Chapa verification."
+    )
+
 
     # payment_method: ENUM (credit_card, paypal, stripe), NOT NULL
     class PaymentMethodChoices(models.TextChoices):
@@ -231,6 +291,9 @@ class Payment(models.Model):
         help_text="The payment method or gateway used."
     )
 
+    objects = models.Manager()
+    with_related = PaymentManager()  # Pre-joined for __str__; see PaymentManager
+
     class Meta:
         verbose_name = "Payment"
         verbose_name_plural = "Payments"
@@ -239,6 +302,14 @@ class Payment(models.Model):
             models.Index(fields=['booking']),  # Additional index on booking
             models.Index(fields=['chapa_transaction_id']), # For quick lookup by Chapa ID
             models.Index(fields=['status']), # For querying payment by status
+            # Partial index for the pending-payment lookups in initiate_chapa_payment (reuse a
+            # recent checkout, close out abandoned initiations), which filter on booking and
+            # payment_date; stays small because settled payments drop out of it.
+            models.Index(
+                fields=['booking', 'payment_date'],
+                condition=models.Q(status='PENDING'),
+                name='payment_pending_date_idx',
+            ),
         ]
 
     def __str__(self):
@@ -263,6 +334,9 @@ class Review(models.Model):
     comment = models.TextField(null=False)  # TEXT, NOT NULL (changed from previous assumption)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = models.Manager()
+    with_related = ReviewManager()  # Pre-joined for __str__; see ReviewManager
+
     class Meta:
         verbose_name = "Review"
         verbose_name_plural = "Reviews"
@@ -308,6 +382,9 @@ class Message(models.Model):
         related_name='replies'  # This is crucial for accessing replies like `message_obj.replies.all()`
     )
 
+    objects = models.Manager()
+    with_related = MessageManager()  # Pre-joined for __str__; see MessageManager
+
     class Meta:
         verbose_name = "Message"
         verbose_name_plural = "Messages"
@@ -318,8 +395,19 @@ class Message(models.Model):
             models.Index(fields=['parent_message']),  # Index for efficient reply lookup
         ]
 
+    def _user_label(self, field_name):
+        # Use the related user's email only if it's already loaded; otherwise fall back
+        # to the raw FK id so repr-heavy contexts don't trigger a query per message.
+        if field_name in self._state.fields_cache:
+            user = self._state.fields_cache[field_name]
+            return user.email if user else 'None'
+        user_id = getattr(self, f'{field_name}_id')
+        return f'<{user_id}>' if user_id else 'None'
+
     def __str__(self):
         # Using sender.email and recipient.email for consistency
-        recipient_str = self.recipient.email if self.recipient else 'None'
-        parent_str = f" (Reply to {self.parent_message.message_id.hex[:8]})" if self.parent_message else ""
-        return f"From {self.sender.email} to {recipient_str}{parent_str}: {self.message_body[:50]}..."
\ No newline at end of file
+        sender_str = self._user_label('sender')
+        recipient_str = self._user_label('recipient')
+        # The parent's id is already on this row; no need to load the parent message.
+        parent_str = f" (Reply to {self.parent_message_id.hex[:8]})" if self.parent_message_id else ""
+        return f"From {sender_str} to {recipient_str}{parent_str}: {self.message_body[:50]}..."
\ No newline at end of file
@@ -1,47 +1,80 @@
 # alx_travel_app/listings/serializers.py
-from random import choice
+from copy import copy
 
 from rest_framework import serializers
 from .models import User, Property, Booking, Message, Review, Payment
 
+# Choice tuples bound once at import rather than re-read from the enums per field.
+PAYMENT_METHOD_CHOICES = tuple(Payment.PaymentMethodChoices.choices)
+CHAPA_STATUS_CHOICES = tuple(Payment.ChapaPaymentStatusChoices.choices)
+
+# --- Base Serializer ---
+
+class CachedFieldsSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that builds its field instances once per class.
+
+    ModelSerializer.get_fields() deep-copies the declared fields and introspects
+    the model on every instantiation. The result only depends on the class, so it
+    is cached and each instance gets shallow copies (bind() then sets the
+    per-instance field_name/parent on the copy).
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {name: copy(field) for name, field in self._fields_cache[cls].items()}
+
 # --- Helper Serializers for Nested Relationships ---
 
-class NestedUserSerializer(serializers.ModelSerializer):
+class NestedUserSerializer(CachedFieldsSerializer):
     """
     Nested serializer for displaying basic user details (used in other serializers).
     """
-    user_id = serializers.UUIDField(read_only=True, help_text="Unique identifier of the user.")
-    first_name = serializers.CharField(read_only=True, help_text="The first name of the user.")
-    last_name = serializers.CharField(read_only=True, help_text="The last name of the user.")
-    email = serializers.EmailField(read_only=True, help_text="The email address of the user.")
-
     class Meta:
         model = User
         fields = ['user_id', 'first_name', 'last_name', 'email']
         read_only_fields = fields
+        extra_kwargs = {
+            'user_id': {'help_text': "Unique identifier of the user."},
+            'first_name': {'help_text': "The first name of the user."},
+            'last_name': {'help_text': "The last name of the user."},
+            'email': {'help_text': "The email address of the user."},
+        }
 
 
-class NestedPropertySerializer(serializers.ModelSerializer):
+class NestedPropertySerializer(CachedFieldsSerializer):
     """
     Nested serializer for displaying basic property details.
     """
-    property_id = serializers.UUIDField(read_only=True, help_text="Unique identifier of the property.")
-    name = serializers.CharField(read_only=True, help_text="The name of the property listing.")
-    location = serializers.CharField(read_only=True, help_text="Location of the property.")
-    price_per_night = serializers.DecimalField(
-        max_digits=10, decimal_places=2, read_only=True,
-        help_text="The price per night for booking this property."
-    )
-
     class Meta:
         model = Property
         fields = ['property_id', 'name', 'location', 'price_per_night']
         read_only_fields = fields
+        extra_kwargs = {
+            'property_id': {'help_text': "Unique identifier of the property."},
+            'name': {'help_text': "The name of the property listing."},
+            'location': {'help_text': "Location of the property."},
+            'price_per_night': {'help_text': "The price per night for booking this property."},
+        }
+
+
+class NestedBookingSerializer(CachedFieldsSerializer):
+    """
+    Nested serializer for displaying basic booking details, without the booked
+    property or guest (used where the parent already identifies them).
+    """
+    class Meta:
+        model = Booking
+        fields = ['booking_id', 'start_date', 'end_date', 'total_price', 'status']
+        read_only_fields = fields
 
 
 # --- Main Serializers ---
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(CachedFieldsSerializer):
     """
     Serializer for creating and retrieving property listings.
     """
@@ -52,16 +85,6 @@ class PropertySerializer(serializers.ModelSerializer):
         write_only=True,
         help_text="UUID of the user who owns this property."
     )
-    name = serializers.CharField(help_text="The name of the property listing.")
-    description = serializers.CharField(help_text="Detailed description of the property.")
-    location = serializers.CharField(help_text="Location/address of the property.")
-    price_per_night = serializers.DecimalField(
-        max_digits=10, decimal_places=2,
-        help_text="Nightly rental price for the property."
-    )
-    created_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the property was created.")
-    updated_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the property was last updated.")
-
     class Meta:
         model = Property
         fields = [
@@ -69,34 +92,36 @@ class PropertySerializer(serializers.ModelSerializer):
             'location', 'price_per_night', 'created_at', 'updated_at'
         ]
         read_only_fields = ['property_id', 'created_at', 'updated_at']
+        extra_kwargs = {
+            'name': {'help_text': "The name of the property listing."},
+            'description': {'help_text': "Detailed description of the property."},
+            'location': {'help_text': "Location/address of the property."},
+            'price_per_night': {'help_text': "Nightly rental price for the property."},
+            'created_at': {'help_text': "Timestamp when the property was created."},
+            'updated_at': {'help_text': "Timestamp when the property was last updated."},
+        }
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(CachedFieldsSerializer):
     """
     Serializer for creating and retrieving bookings.
     """
+    # Relations rendered by the nested serializers; joined by the viewset queryset.
+    select_related = ('property', 'user')
+
     property = NestedPropertySerializer(read_only=True, help_text="Details of the booked property (read-only).")
     user = NestedUserSerializer(read_only=True, help_text="Details of the guest making the booking (read-only).")
 
     # Only property_id should be provided by the client
     property_id = serializers.PrimaryKeyRelatedField(
-        queryset=Property.objects.all(),
+        # The validated property is reused for the price calculation, the confirmation
+        # email and the nested response, so only the columns those read are loaded.
+        queryset=Property.objects.only('property_id', 'name', 'location', 'price_per_night'),
         source='property',
         write_only=True,
         help_text="UUID of the property being booked."
     )
 
-    start_date = serializers.DateField(help_text="The start date of the booking.")
-    end_date = serializers.DateField(help_text="The end date of the booking.")
-
-    # Automatically calculated
-    total_price = serializers.DecimalField(
-        max_digits=10, decimal_places=2, read_only=True,
-        help_text="Total calculated price for the entire booking duration."
-    )
-    status = serializers.CharField(read_only=True, help_text="Current status of the booking (pending, confirmed, or canceled).")
-    created_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the booking was created.")
-
     class Meta:
         model = Booking
         fields = [
@@ -104,15 +129,27 @@ class BookingSerializer(serializers.ModelSerializer):
             'start_date', 'end_date', 'total_price', 'status', 'created_at'
         ]
         read_only_fields = ['booking_id', 'property', 'user', 'total_price', 'status', 'created_at']
+        extra_kwargs = {
+            'start_date': {'help_text': "The start date of the booking."},
+            'end_date': {'help_text': "The end date of the booking."},
+            # Automatically calculated
+            'total_price': {'help_text': "Total calculated price for the entire booking duration."},
+            'status': {'help_text': "Current status of the booking (pending, confirmed, or canceled)."},
+            'created_at': {'help_text': "Timestamp when the booking was created."},
+        }
 
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(CachedFieldsSerializer):
     """
     Serializer for sending and retrieving direct messages between users.
     """
+    # Relations rendered by the nested serializers; joined by the viewset queryset.
+    select_related = ('sender', 'recipient')
     sender = NestedUserSerializer(read_only=True, help_text="Details of the sender (read-only).")
     receiver = NestedUserSerializer(read_only=True, help_text="Details of the recipient (read-only).")
-    parent_message = serializers.SerializerMethodField(read_only=True, help_text="ID of the parent message if this is a reply.")
+    # Read-only PK fields render from parent_message_id on the row itself, without
+    # loading the parent message.
+    parent_message = serializers.PrimaryKeyRelatedField(read_only=True, help_text="ID of the parent message if this is a reply.")
     sender_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True,
@@ -130,8 +167,6 @@ class MessageSerializer(serializers.ModelSerializer):
         write_only=True,
         help_text="Optional UUID of the parent message when replying."
     )
-    message_body = serializers.CharField(help_text="Content of the message being sent.")
-    sent_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the message was sent.")
     is_read = serializers.BooleanField(read_only=True, help_text="Indicates if the message has been read.")
     edited = serializers.BooleanField(read_only=True, help_text="Indicates if the message has been edited.")
     edited_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the message was last edited.")
@@ -144,16 +179,20 @@ class MessageSerializer(serializers.ModelSerializer):
             'sent_at', 'is_read', 'edited', 'edited_at'
         ]
         read_only_fields = ['message_id', 'sender', 'receiver', 'parent_message', 'sent_at', 'is_read', 'edited', 'edited_at']
-
-    def get_parent_message(self, obj):
-        return str(obj.parent_message.message_id) if hasattr(obj, 'parent_message') and obj.parent_message else None
+        extra_kwargs = {
+            'message_body': {'help_text': "Content of the message being sent."},
+            'sent_at': {'help_text': "Timestamp when the message was sent."},
+        }
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(CachedFieldsSerializer):
     """
     Serializer for creating and retrieving property reviews.
     """
-    property = PropertySerializer(read_only=True, help_text="Details of the property being reviewed (read-only).")
+    # Relations rendered by the nested serializers; joined by the viewset queryset.
+    select_related = ('property', 'user')
+
+    property = NestedPropertySerializer(read_only=True, help_text="Details of the property being reviewed (read-only).")
     user = NestedUserSerializer(read_only=True, help_text="Details of the user leaving the review (read-only).")
     property_id = serializers.PrimaryKeyRelatedField(
         queryset=Property.objects.all(),
@@ -165,9 +204,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         write_only=True,
         help_text="UUID of the user leaving the review."
     )
-    rating = serializers.IntegerField(help_text="Rating for the property (1 to 5).")
-    comment = serializers.CharField(help_text="Detailed review comment about the property.")
-    created_at = serializers.DateTimeField(read_only=True, help_text="Timestamp when the review was created.")
 
     class Meta:
         model = Review
@@ -176,41 +212,38 @@ class ReviewSerializer(serializers.ModelSerializer):
             'rating', 'comment', 'created_at'
         ]
         read_only_fields = ['review_id', 'property', 'user', 'created_at']
+        extra_kwargs = {
+            'rating': {'help_text': "Rating for the property (1 to 5)."},
+            'comment': {'help_text': "Detailed review comment about the property."},
+            'created_at': {'help_text': "Timestamp when the review was created."},
+        }
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(CachedFieldsSerializer):
     """
     Serializer for recording and retrieving payment details.
     Updated for Chapa Integration.
     """
-    booking = BookingSerializer(read_only=True, help_text="Details of the related booking (read-only).")
+    # Relations rendered by the nested serializers; joined by the viewset queryset.
+    select_related = ('booking',)
+
+    booking = NestedBookingSerializer(read_only=True, help_text="Details of the related booking (read-only).")
     booking_id = serializers.PrimaryKeyRelatedField(
         queryset=Booking.objects.all(),
         write_only=True,
         help_text="UUID of the booking for which the payment is made."
     )
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2, help_text="Amount paid for the booking.")
-    payment_date = serializers.DateTimeField(read_only=True, help_text="Timestamp when the payment was recorded.")
     payment_method = serializers.ChoiceField(
-        choices=Payment.PaymentMethodChoices.choices,
+        choices=PAYMENT_METHOD_CHOICES,
         help_text="Payment method used (Chapa, credit_card, PayPal, or Stripe)."
     )
 
     # New fields
-    chapa_transaction_id = serializers.CharField(
-        read_only=True,
-        help_text="Chapa's unique transaction id (read-only)."
-    )
     status = serializers.ChoiceField(
-        choices=Payment.ChapaPaymentStatusChoices.choices,
+        choices=CHAPA_STATUS_CHOICES,
         read_only=True, # Status is updated by the system based on Chapa responses
         help_text="The status of the payment (PENDING, COMPLETED, FAILED, etc.)."
     )
-    chapa_status_text = serializers.CharField(
-        read_only=True,
-        allow_null=True,
-        help_text="Detailed status message from Chapa."
-    )
 
     class Meta:
         model = Payment
@@ -221,4 +254,77 @@ class PaymentSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'payment_id', 'booking', 'payment_date',
             'chapa_transaction_id', 'status', 'chapa_status_text' # All chapa related fields are read-only from API consumer perspective
-        ]
\ No newline at end of file
+        ]
+        extra_kwargs = {
+            'amount': {'help_text': "Amount paid for the booking."},
+            'payment_date': {'help_text': "Timestamp when the payment was recorded."},
+            'chapa_transaction_id': {'help_text': "Chapa's unique transaction id (read-only)."},
+            'chapa_status_text': {'help_text': "Detailed status message from Chapa."},
+        }
+
+# --- List Serializers (values() rows) ---
+# List endpoints fetch plain dicts with .values() instead of model instances.
+# These read-only serializers render those rows in the same shape as the
+# model serializers above; nested objects read their prefixed keys via source='*'.
+
+class UserValuesSerializer(serializers.Serializer):
+    user_id = serializers.UUIDField(source='user__user_id')
+    first_name = serializers.CharField(source='user__first_name')
+    last_name = serializers.CharField(source='user__last_name')
+    email = serializers.EmailField(source='user__email')
+
+
+class PropertyValuesSerializer(serializers.Serializer):
+    property_id = serializers.UUIDField(source='property__property_id')
+    name = serializers.CharField(source='property__name')
+    location = serializers.CharField(source='property__location')
+    price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2, source='property__price_per_night')
+
+
+class BookingValuesSerializer(serializers.Serializer):
+    booking_id = serializers.UUIDField(source='booking__booking_id')
+    start_date = serializers.DateField(source='booking__start_date')
+    end_date = serializers.DateField(source='booking__end_date')
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2, source='booking__total_price')
+    status = serializers.CharField(source='booking__status')
+
+
+class BookingListSerializer(serializers.Serializer):
+    """
+    Read-only serializer for booking list rows; same output as BookingSerializer.
+    """
+    values_fields = (
+        'booking_id', 'start_date', 'end_date', 'total_price', 'status', 'created_at',
+        'property__property_id', 'property__name', 'property__location', 'property__price_per_night',
+        'user__user_id', 'user__first_name', 'user__last_name', 'user__email',
+    )
+
+    booking_id = serializers.UUIDField()
+    property = PropertyValuesSerializer(source='*')
+    user = UserValuesSerializer(source='*')
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    status = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class PaymentListSerializer(serializers.Serializer):
+    """
+    Read-only serializer for payment list rows; same output as PaymentSerializer.
+    """
+    values_fields = (
+        'payment_id', 'amount', 'payment_date', 'payment_method',
+        'chapa_transaction_id', 'status', 'chapa_status_text',
+        'booking__booking_id', 'booking__start_date', 'booking__end_date',
+        'booking__total_price', 'booking__status',
+    )
+
+    payment_id = serializers.UUIDField()
+    booking = BookingValuesSerializer(source='*')
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    payment_date = serializers.DateTimeField()
+    payment_method = serializers.CharField()
+    chapa_transaction_id = serializers.CharField()
+    status = serializers.CharField()
+    chapa_status_text = serializers.CharField()
@@ -0,0 +1,25 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .serializers import NestedUserSerializer
+
+# Cache key holding the version number baked into cached user API responses.
+USERS_CACHE_VERSION_KEY = 'users:version'
+
+# User columns rendered in the cached responses; saves touching none of them
+# (e.g. update_last_login) leave the cache alone.
+USERS_CACHED_FIELDS = frozenset(NestedUserSerializer.Meta.fields)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users_cache_version(sender, update_fields=None, **kwargs):
+    """
+    Invalidates the cached user list/detail responses by bumping their version.
+    """
+    if update_fields is not None and USERS_CACHED_FIELDS.isdisjoint(update_fields):
+        return
+    cache.add(USERS_CACHE_VERSION_KEY, 1, timeout=None)
+    cache.incr(USERS_CACHE_VERSION_KEY)
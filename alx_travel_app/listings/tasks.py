@@ -1,31 +1,92 @@
+import logging
+from smtplib import SMTPException
+
+import requests
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .chapa import (
+    CHAPA_SESSION,
+    CHAPA_TIMEOUT,
+    CHAPA_TX_STATUS_TIMEOUT,
+    CHAPA_VERIFY_CLAIM_TTL,
+    CHAPA_VERIFY_URL,
+    tx_status_cache_key,
+)
 from .models import Booking, Payment
 
-@shared_task
-def send_booking_confirmation_email(booking_id_str, recipient_email):
+logger = logging.getLogger(__name__)
+
+# Retry policy for email tasks: transient SMTP failures are retried with backoff,
+# and tasks are only acked once they finish so a worker crash doesn't drop an email.
+EMAIL_TASK_OPTIONS = {
+    'acks_late': True,
+    'autoretry_for': (SMTPException,),
+    'max_retries': 3,
+    'retry_backoff': True,
+}
+
+# Email templates, filled with str.format_map() so the text is defined once per process.
+BOOKING_CONFIRMATION_SUBJECT = "Your Booking #{booking_ref} is Confirmed with ALX Travel."
+BOOKING_CONFIRMATION_BODY = (
+    "Dear {first_name},\n\n"
+    "Thank you for booking with ALX Travel!\n\n"
+    "Your booking for '{property_name}' "
+    "located in {location} "
+    "from {start_date} to {end_date} "
+    "has been successfully confirmed.\n\n"
+    "Price per night: {price_per_night} USD\n"
+    "Total price: {total_price} USD\n\n"
+    "We look forward to hosting you!\n\n"
+    "Best regards,\n"
+    "ALX Travel Team"
+)
+
+PAYMENT_CONFIRMATION_SUBJECT = "Your Payment for Booking {booking_ref} is Confirmed!"
+PAYMENT_CONFIRMATION_BODY = (
+    "Dear customer,\n\n"
+    "Your payment of {amount} ETB for booking {booking_ref} "
+    "has been successfully processed. Payment ID: {payment_ref}...\n\n"
+    "Thank you for choosing ALX Travel!\n\n"
+    "Best regards,\n"
+    "The ALX Travel Team"
+)
+
+
+def booking_confirmation_context(booking):
+    """
+    Builds the booking confirmation email context from a booking whose property and
+    user are already loaded. Callers pass this dict to the task, so the worker never
+    has to read the booking back from the database. All values are strings so the
+    dict is JSON serializable for Celery.
+    """
+    return {
+        'booking_id': str(booking.booking_id),
+        'booking_ref': str(booking.booking_id)[:8],
+        'first_name': booking.user.first_name,
+        'property_name': booking.property.name,
+        'location': booking.property.location,
+        'start_date': str(booking.start_date),
+        'end_date': str(booking.end_date),
+        'price_per_night': str(booking.property.price_per_night),
+        'total_price': str(booking.total_price),
+    }
+
+
+@shared_task(**EMAIL_TASK_OPTIONS)
+def send_booking_confirmation_email(ctx, recipient_email):
     """
     Sends a booking confirmation email asynchronously.
-    `booking_id_str` is passed as a string because UUIDs are not directly
-    JSON serializable by default with Celery, but strings are.
+    `ctx` is built by `booking_confirmation_context()` in the caller.
     """
     try:
-        booking = Booking.objects.get(booking_id=booking_id_str)
-        subject = f"Your Booking #{str(booking.booking_id)[:8]} is Confirmed with ALX Travel."
-        message = (
-            f"Dear {booking.user.first_name},\n\n"
-            f"Thank you for booking with ALX Travel!\n\n"
-            f"Your booking for '{booking.property.name}' "
-            f"located in {booking.property.location} "
-            f"from {booking.start_date} to {booking.end_date} "
-            f"has been successfully confirmed.\n\n"
-            f"Price per night: {booking.property.price_per_night} USD\n"
-            f"Total price: {booking.total_price} USD\n\n"
-            f"We look forward to hosting you!\n\n"
-            f"Best regards,\n"
-            f"ALX Travel Team"
-        )
+        subject = BOOKING_CONFIRMATION_SUBJECT.format_map(ctx)
+        message = BOOKING_CONFIRMATION_BODY.format_map(ctx)
         from_email = settings.DEFAULT_FROM_EMAIL
 
         send_mail(
@@ -36,16 +97,17 @@ def send_booking_confirmation_email(booking_id_str, recipient_email):
             fail_silently=False,
         )
 
-        print(f"DEBUG: Booking confirmation email for booking {booking_id_str} sent to {recipient_email}")
-    except Booking.DoesNotExist:
-        print(f"ERROR: Booking {booking_id_str} not found for email notification.")
+        logger.debug("Booking confirmation email for booking %s sent to %s", ctx['booking_id'], recipient_email)
+    except SMTPException:
+        raise  # Let Celery retry transient SMTP failures
     except Exception as e:
-        print(
-            f"ERROR: Failed to send booking confirmation email for booking {booking_id_str} "
-            f"to {recipient_email}: {e}"
+        logger.error(
+            "Failed to send booking confirmation email for booking %s to %s: %s",
+            ctx.get('booking_id'), recipient_email, e,
         )
 
-@shared_task
+
+@shared_task(**EMAIL_TASK_OPTIONS)
 def send_payment_confirmation_email(payment_id_str, recipient_email, amount, booking_ref):
     """
     Sends a payment confirmation email asynchronously.
@@ -54,15 +116,9 @@ def send_payment_confirmation_email(payment_id_str, recipient_email, amount, boo
     try:
         # In a real app, you might fetch the Payment object here too,
         # but for this specific task, direct parameters are fine.
-        subject = f"Your Payment for Booking {booking_ref} is Confirmed!"
-        message = (
-            f"Dear customer,\n\n"
-            f"Your payment of {amount} ETB for booking {booking_ref} "
-            f"has been successfully processed. Payment ID: {payment_id_str[:8]}...\n\n"
-            f"Thank you for choosing ALX Travel!\n\n"
-            f"Best regards,\n"
-            f"The ALX Travel Team"
-        )
+        ctx = {'amount': amount, 'booking_ref': booking_ref, 'payment_ref': payment_id_str[:8]}
+        subject = PAYMENT_CONFIRMATION_SUBJECT.format_map(ctx)
+        message = PAYMENT_CONFIRMATION_BODY.format_map(ctx)
         from_email = settings.DEFAULT_FROM_EMAIL
 
         send_mail(
@@ -72,6 +128,101 @@ def send_payment_confirmation_email(payment_id_str, recipient_email, amount, boo
             [recipient_email],
             fail_silently=False,
         )
-        print(f"DEBUG: Payment confirmation email for booking {booking_ref} (Payment ID: {payment_id_str}) sent to {recipient_email}.")
+        logger.debug(
+            "Payment confirmation email for booking %s (Payment ID: %s) sent to %s.",
+            booking_ref, payment_id_str, recipient_email,
+        )
+    except SMTPException:
+        raise  # Let Celery retry transient SMTP failures
     except Exception as e:
-        print(f"ERROR: Failed to send payment confirmation email for booking {booking_ref} to {recipient_email}: {e}")
\ No newline at end of file
+        logger.error(
+            "Failed to send payment confirmation email for booking %s to %s: %s",
+            booking_ref, recipient_email, e,
+        )
+
+
+@shared_task(bind=True, max_retries=5)
+def verify_chapa_payment_task(self, tx_ref):
+    """
+    Verifies a Chapa transaction and updates the payment and booking.
+    Runs on a worker so the Chapa callback request doesn't block on the verify API;
+    network errors are retried with exponential backoff before the payment is marked failed.
+    """
+    # Chapa's callback and the user's return redirect can queue this task twice for the
+    # same tx_ref. A single conditional UPDATE claims the pending row, so only one worker
+    # talks to Chapa, and no lock or transaction is held during the HTTP call. A claim
+    # older than CHAPA_VERIFY_CLAIM_TTL (e.g. from a crashed worker) can be retaken.
+    claimed_at = timezone.now()
+    claimed = Payment.objects.filter(
+        Q(verification_claimed_at__isnull=True) | Q(verification_claimed_at__lt=claimed_at - CHAPA_VERIFY_CLAIM_TTL),
+        chapa_transaction_id=tx_ref,
+        status=Payment.ChapaPaymentStatusChoices.PENDING,
+    ).update(verification_claimed_at=claimed_at)
+    if not claimed:
+        # Missing, already processed, or claimed by a concurrent verification.
+        logger.debug("No pending payment to verify for tx_ref %s. Skipping re-verification.", tx_ref)
+        return
+
+    # chapa_transaction_id is unique (and indexed), so this is a single index lookup.
+    # Only the columns read below are loaded; status changes are written with
+    # narrow UPDATEs rather than saving the instances.
+    payment = Payment.objects.select_related('booking__user').only(
+        'payment_id', 'amount',
+        'booking', 'booking__booking_id',
+        'booking__user', 'booking__user__email',
+    ).get(chapa_transaction_id=tx_ref)
+    # Writes only land while our claim still holds.
+    claimed_payment = Payment.objects.filter(pk=payment.pk, verification_claimed_at=claimed_at)
+
+    try:
+        chapa_response = CHAPA_SESSION.get(f"{CHAPA_VERIFY_URL}{tx_ref}", timeout=CHAPA_TIMEOUT)
+        chapa_response.raise_for_status()
+        response_data = chapa_response.json()
+    except requests.exceptions.RequestException as e:
+        if self.request.retries < self.max_retries:
+            # Release the claim so the retry can take it again.
+            claimed_payment.update(verification_claimed_at=None)
+            raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        logger.error("Chapa API verification failed for tx_ref %s: %s", tx_ref, e)
+        final_status = Payment.ChapaPaymentStatusChoices.FAILED
+        if not claimed_payment.update(
+            status=final_status,
+            chapa_status_text=f"API Verification Error: {e}",
+        ):
+            logger.debug("Claim on payment %s was taken over. Skipping result.", tx_ref)
+            return
+    else:
+        logger.debug("Chapa verification response for %s: %s", tx_ref, response_data)
+
+        # Chapa's verification response structure:
+        # { "status": "success", "message": "Payment details", "data": { ... payment info ... "status": "success", ... } }
+        data = response_data.get('data') or {}
+        if response_data.get('status') == 'success' and data.get('status') == 'success':
+            final_status = Payment.ChapaPaymentStatusChoices.COMPLETED
+            with transaction.atomic():
+                if not claimed_payment.update(
+                    status=final_status,
+                    chapa_status_text=data.get('status', 'Payment completed successfully.'),
+                ):
+                    logger.debug("Claim on payment %s was taken over. Skipping result.", tx_ref)
+                    return
+
+                # Update booking status if payment is successful
+                booking = payment.booking
+                if Booking.objects.filter(pk=booking.pk).exclude(
+                    status=Booking.BookingStatusChoices.CONFIRMED
+                ).update(status=Booking.BookingStatusChoices.CONFIRMED):
+                    logger.debug("Booking %s status updated to CONFIRMED.", booking.booking_id)
+
+                payment_args = (str(payment.payment_id), booking.user.email, payment.amount, str(booking.booking_id))
+                transaction.on_commit(lambda: send_payment_confirmation_email.delay(*payment_args))
+        else:
+            final_status = Payment.ChapaPaymentStatusChoices.FAILED
+            status_text = data.get('message', response_data.get('message', 'Payment verification failed.'))
+            if not claimed_payment.update(status=final_status, chapa_status_text=status_text):
+                logger.debug("Claim on payment %s was taken over. Skipping result.", tx_ref)
+                return
+            logger.debug("Payment %s failed. Status: %s", tx_ref, status_text)
+
+    # Terminal status: later callbacks for this tx_ref can redirect without a DB read.
+    cache.set(tx_status_cache_key(tx_ref), final_status, timeout=CHAPA_TX_STATUS_TIMEOUT)
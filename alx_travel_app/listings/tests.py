@@ -1,3 +1,204 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import requests
+from celery.exceptions import Retry
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import User, Property, Booking, Payment, Message
+from .tasks import verify_chapa_payment_task
+
+
+def create_user(name, **extra_fields):
+    return User.objects.create_user(
+        email=f"{name}@example.com",
+        password='test-pass-123',
+        username=name,
+        first_name=name.title(),
+        last_name='Tester',
+        **extra_fields,
+    )
+
+
+class ChapaTestCase(TestCase):
+    """
+    Shared fixtures: a host, a guest, one property and one booking by the guest.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.host = create_user('host', role=User.RoleChoices.HOST)
+        self.guest = create_user('guest')
+        self.property = Property.objects.create(
+            host=self.host,
+            name='Cozy Beachfront Villa',
+            description='Two bedrooms by the sea.',
+            location='Malibu, CA',
+            price_per_night=Decimal('100.00'),
+        )
+        self.booking = Booking.objects.create(
+            property=self.property,
+            user=self.guest,
+            start_date=date(2026, 11, 1),
+            end_date=date(2026, 11, 3),
+            total_price=Decimal('200.00'),
+        )
+
+    def create_payment(self, tx_ref, **fields):
+        return Payment.objects.create(
+            booking=self.booking,
+            amount=self.booking.total_price,
+            payment_method=Payment.PaymentMethodChoices.CHAPA,
+            chapa_transaction_id=tx_ref,
+            status=Payment.ChapaPaymentStatusChoices.PENDING,
+            **fields,
+        )
+
+
+class InitiateChapaPaymentTests(ChapaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.guest)
+        self.url = reverse('chapa_initiate_payment')
+
+    def post_initiate(self):
+        return self.client.post(
+            self.url,
+            data=json.dumps({'booking_id': str(self.booking.booking_id), 'amount': '200.00'}),
+            content_type='application/json',
+        )
+
+    @patch('listings.views.CHAPA_SESSION')
+    def test_reuses_recent_pending_checkout(self, session):
+        self.create_payment('tx-existing', checkout_url='https://checkout.chapa.co/existing')
+
+        response = self.post_initiate()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['checkout_url'], 'https://checkout.chapa.co/existing')
+        self.assertEqual(response.json()['tx_ref'], 'tx-existing')
+        session.post.assert_not_called()
+        self.assertEqual(Payment.objects.count(), 1)
+
+    @patch('listings.views.CHAPA_SESSION')
+    def test_initiation_in_progress_returns_409(self, session):
+        self.create_payment('tx-in-flight')
+
+        response = self.post_initiate()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['tx_ref'], 'tx-in-flight')
+        session.post.assert_not_called()
+        self.assertEqual(Payment.objects.count(), 1)
+
+    @patch('listings.views.CHAPA_SESSION')
+    def test_abandoned_initiation_is_marked_failed(self, session):
+        abandoned = self.create_payment('tx-abandoned')
+        # payment_date is auto_now_add, so age the row with an UPDATE.
+        Payment.objects.filter(pk=abandoned.pk).update(payment_date=timezone.now() - timedelta(minutes=5))
+        session.post.return_value.json.return_value = {
+            'status': 'success',
+            'message': 'Hosted Link',
+            'data': {'checkout_url': 'https://checkout.chapa.co/new'},
+        }
+
+        response = self.post_initiate()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['checkout_url'], 'https://checkout.chapa.co/new')
+        session.post.assert_called_once()
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, Payment.ChapaPaymentStatusChoices.FAILED)
+        self.assertEqual(abandoned.chapa_status_text, 'Initiation abandoned')
+        new_payment = Payment.objects.get(chapa_transaction_id=response.json()['tx_ref'])
+        self.assertEqual(new_payment.status, Payment.ChapaPaymentStatusChoices.PENDING)
+        self.assertEqual(new_payment.checkout_url, 'https://checkout.chapa.co/new')
+
+
+class VerifyChapaPaymentTaskTests(ChapaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.payment = self.create_payment('tx-verify')
+
+    @patch('listings.tasks.CHAPA_SESSION')
+    def test_skips_payment_claimed_by_another_worker(self, session):
+        Payment.objects.filter(pk=self.payment.pk).update(verification_claimed_at=timezone.now())
+
+        verify_chapa_payment_task('tx-verify')
+
+        session.get.assert_not_called()
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.ChapaPaymentStatusChoices.PENDING)
+
+    @patch('listings.tasks.send_payment_confirmation_email')
+    @patch('listings.tasks.CHAPA_SESSION')
+    def test_stale_claim_is_retaken(self, session, send_email):
+        Payment.objects.filter(pk=self.payment.pk).update(
+            verification_claimed_at=timezone.now() - timedelta(minutes=10)
+        )
+        session.get.return_value.json.return_value = {'status': 'success', 'data': {'status': 'success'}}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            verify_chapa_payment_task('tx-verify')
+
+        session.get.assert_called_once()
+        self.payment.refresh_from_db()
+        self.booking.refresh_from_db()
+        self.assertEqual(self.payment.status, Payment.ChapaPaymentStatusChoices.COMPLETED)
+        self.assertEqual(self.booking.status, Booking.BookingStatusChoices.CONFIRMED)
+        send_email.delay.assert_called_once()
+
+    @patch('listings.tasks.CHAPA_SESSION')
+    def test_releases_claim_before_retry(self, session):
+        session.get.side_effect = requests.exceptions.ConnectionError('connection reset')
+
+        with patch.object(verify_chapa_payment_task, 'retry', side_effect=Retry()):
+            with self.assertRaises(Retry):
+                verify_chapa_payment_task('tx-verify')
+
+        self.payment.refresh_from_db()
+        self.assertIsNone(self.payment.verification_claimed_at)
+        self.assertEqual(self.payment.status, Payment.ChapaPaymentStatusChoices.PENDING)
+
+
+class ListEndpointTests(ChapaTestCase):
+    """
+    Smoke tests for the UNION-backed list endpoints, for both sides of each union.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_payment('tx-list', checkout_url='https://checkout.chapa.co/list')
+        Message.objects.create(sender=self.guest, recipient=self.host, message_body='Is parking included?')
+
+    def assert_list_length(self, user, url_name, expected):
+        self.client.force_login(user)
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), expected)
+        return response.json()
+
+    def test_booking_list(self):
+        for user in (self.guest, self.host):
+            rows = self.assert_list_length(user, 'bookings-list', 1)
+            self.assertEqual(rows[0]['booking_id'], str(self.booking.booking_id))
+            self.assertEqual(rows[0]['property']['name'], 'Cozy Beachfront Villa')
+            self.assertEqual(rows[0]['user']['email'], self.guest.email)
+
+    def test_payment_list(self):
+        for user in (self.guest, self.host):
+            rows = self.assert_list_length(user, 'payments-list', 1)
+            self.assertEqual(rows[0]['chapa_transaction_id'], 'tx-list')
+            self.assertEqual(rows[0]['booking']['booking_id'], str(self.booking.booking_id))
 
-# Create your tests here.
+    def test_message_list(self):
+        for user in (self.guest, self.host):
+            rows = self.assert_list_length(user, 'messages-list', 1)
+            self.assertEqual(rows[0]['message_body'], 'Is parking included?')
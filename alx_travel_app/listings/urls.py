@@ -1,10 +1,10 @@
 # alx_travel_app/listings/urls.py
-from django.http import JsonResponse
-from django.urls import path # Import path
+from django.urls import include, path # Import path
 from rest_framework.routers import DefaultRouter
 from .views import (UserViewSet, BookingViewSet, PaymentViewSet,
                     ReviewViewSet, MessageViewSet, PropertyViewSet,
-                    initiate_chapa_payment, verify_chapa_payment) # Import new views
+                    initiate_chapa_payment, verify_chapa_payment,
+                    payment_success, payment_fail, payment_status) # Import new views
 
 #Create a router and register our viewsets with it
 router = DefaultRouter()
@@ -16,15 +16,24 @@ router.register(r'reviews', ReviewViewSet, basename='reviews')
 router.register(r'messages', MessageViewSet, basename='messages')
 
 
+# Chapa integration endpoints, grouped so the resolver matches their shared prefix once.
+# tx_ref is "<booking hex>-<uuid hex>", so the slug converter rejects anything else early.
+chapa_patterns = [
+    path('initiate/', initiate_chapa_payment, name='chapa_initiate_payment'),
+    path('verify/<slug:tx_ref>/', verify_chapa_payment, name='chapa_verify_payment'),
+]
+
+# The hot payment endpoints come first so they are matched before the router patterns.
+urlpatterns = [
+    path('api/payments/chapa/', include(chapa_patterns)),
+]
+
 #The API URLS are now automatically determined by the router
-urlpatterns = router.urls
+urlpatterns += router.urls
 
-# Add new URL patterns for Chapa integration
 urlpatterns += [
-    path('api/payments/chapa/initiate/', initiate_chapa_payment, name='chapa_initiate_payment'),
-    path('api/payments/chapa/verify/<str:tx_ref>/', verify_chapa_payment, name='chapa_verify_payment'),
     # Add simple placeholder URLs for success/fail pages (you'd implement these with proper templates/views)
-    path('payment-success/', lambda request: JsonResponse({'message': 'Payment successful!'}), name='payment_success'),
-    path('payment-fail/', lambda request: JsonResponse({'message': 'Payment failed!'}), name='payment_fail'),
-    path('payment-status/', lambda request: JsonResponse({'message': 'Payment status check.'}), name='payment_status'),
-]
\ No newline at end of file
+    path('payment-success/', payment_success, name='payment_success'),
+    path('payment-fail/', payment_fail, name='payment_fail'),
+    path('payment-status/', payment_status, name='payment_status'),
+]
@@ -3,19 +3,42 @@ from drf_spectacular.types import OpenApiTypes
 from rest_framework import viewsets, filters, status, permissions
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny, IsAdminUser
+from django.db import transaction
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, inline_serializer, OpenApiParameter
 from rest_framework import serializers # Needed for inline_serializer
 
 # New imports for Chapa and Celery
+import logging
+from functools import wraps
 import requests
 import json
 import uuid # For generating unique transaction references
-from django.conf import settings
-from django.http import JsonResponse, HttpResponseRedirect
+from decimal import Decimal, InvalidOperation
+from django.core.cache import cache
+from django.http import JsonResponse, HttpResponse, HttpResponseRedirect
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.cache import get_cache_key, learn_cache_key, patch_response_headers
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
 from django.views.decorators.csrf import csrf_exempt # Use with caution in production, or use DRF's APIView
-from django.shortcuts import get_object_or_404
-from .tasks import send_booking_confirmation_email, send_payment_confirmation_email
+from .chapa import (
+    CHAPA_CHECKOUT_REUSE_WINDOW,
+    CHAPA_INITIATION_TIMEOUT,
+    CHAPA_CUSTOMIZATION_TITLE,
+    CHAPA_INITIATE_URL,
+    CHAPA_PAYLOAD_TEMPLATE,
+    CHAPA_SESSION,
+    CHAPA_TIMEOUT,
+    tx_status_cache_key,
+)
+from .signals import USERS_CACHE_VERSION_KEY
+from .tasks import (
+    booking_confirmation_context,
+    send_booking_confirmation_email,
+    verify_chapa_payment_task,
+)
 
 
 from .serializers import (
@@ -25,15 +48,13 @@ from .serializers import (
     BookingSerializer,
     MessageSerializer,
     ReviewSerializer,
-    PaymentSerializer
+    PaymentSerializer,
+    BookingListSerializer,
+    PaymentListSerializer,
 )
 from .models import User, Property, Booking, Payment, Review, Message
 
-
-# --- Chapa API Endpoints (Constants) ---
-CHAPA_INITIATE_URL = "https://api.chapa.co/v1/initialize"
-CHAPA_VERIFY_URL = "https://api.chapa.co/v1/verify/" # Note: takes a transaction_id after the slash
-
+logger = logging.getLogger(__name__)
 
 
 # -------------------------
@@ -59,6 +80,78 @@ class IsMessageSender(IsAuthenticated):
         return request.method in permissions.SAFE_METHODS or obj.sender == request.user
 
 
+# -------------------------
+# MIXINS
+# -------------------------
+class ActionPermissionsMixin:
+    """
+    Returns the permissions listed for the current action in `action_permissions`,
+    falling back to its 'default' entry; `permission_classes` is not consulted. The
+    permission classes are stateless, so the instances are built once with the viewset
+    class and shared across requests.
+    """
+    action_permissions = {}
+
+    def get_permissions(self):
+        return self.action_permissions.get(self.action, self.action_permissions['default'])
+
+
+# Actions that modify an existing object and need an object-level ownership check.
+OBJECT_WRITE_ACTIONS = ('update', 'partial_update', 'destroy')
+
+
+class SerializerSelectRelatedMixin:
+    """
+    Applies the serializer class's `select_related` hint to the viewset queryset,
+    so nested serializers read joined rows instead of querying once per object.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        related = getattr(self.get_serializer_class(), 'select_related', ())
+        return queryset.select_related(*related) if related else queryset
+
+
+def cache_page_versioned(timeout, version_key):
+    """
+    Like `cache_page`, but the cache key prefix includes the current value stored under
+    `version_key`, so bumping that value invalidates every cached response at once.
+    Keys are computed with django.utils.cache directly rather than building a
+    `cache_page` decorator and middleware per request.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            # A single GET once the version key exists.
+            key_prefix = f"{version_key}:{cache.get_or_set(version_key, 1, timeout=None)}"
+            cache_key = get_cache_key(request, key_prefix, 'GET', cache=cache)
+            if cache_key is not None:
+                response = cache.get(cache_key)
+                if response is not None:
+                    return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.streaming or response.status_code != 200:
+                return response
+
+            patch_response_headers(response, timeout)
+
+            def store(rendered):
+                cache.set(learn_cache_key(request, rendered, timeout, key_prefix, cache=cache), rendered, timeout)
+
+            # DRF responses are rendered after the view returns; store them once rendered.
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+            return response
+        return wrapped
+    return decorator
+
+
 # -------------------------
 # VIEWS
 # -------------------------
@@ -68,10 +161,14 @@ class IsMessageSender(IsAuthenticated):
     summary="Retrieve user information",
     description="Provides read-only access to user profiles. Intended for public profile data retrieval.",
 )
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+# Public and read-only, so responses are cached briefly; saving or deleting a user
+# bumps the version (see signals.py) and drops them early.
+@method_decorator(cache_page_versioned(60, USERS_CACHE_VERSION_KEY), name='list')
+@method_decorator(cache_page_versioned(60, USERS_CACHE_VERSION_KEY), name='retrieve')
+class UserViewSet(ActionPermissionsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = NestedUserSerializer
-    permission_classes = [AllowAny]
+    action_permissions = {'default': [AllowAny()]}
 
 
 @extend_schema(
@@ -111,10 +208,14 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         404: OpenApiResponse(description="Property not found."),
     }
 )
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(ActionPermissionsMixin, viewsets.ModelViewSet):
     queryset = Property.objects.all()
     serializer_class = NestedPropertySerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    action_permissions = {
+        'create': [IsAuthenticated()],
+        **dict.fromkeys(OBJECT_WRITE_ACTIONS, [IsAuthenticated(), IsPropertyHost()]),
+        'default': [AllowAny()],
+    }
 
     def perform_create(self, serializer):
         serializer.save(host=self.request.user)
@@ -122,15 +223,6 @@ class PropertyViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return super().get_queryset()
 
-    def get_permissions(self):
-        if self.action in ['update', 'partial_update', 'destroy']:
-            self.permission_classes = [IsAuthenticated, IsPropertyHost]
-        elif self.action == 'create':
-            self.permission_classes = [IsAuthenticated]
-        else:
-            self.permission_classes = [AllowAny]
-        return [permission() for permission in self.permission_classes]
-
 
 @extend_schema(
     tags=["Bookings"],
@@ -169,10 +261,18 @@ class PropertyViewSet(viewsets.ModelViewSet):
         )
     }
 )
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(ActionPermissionsMixin, SerializerSelectRelatedMixin, viewsets.ModelViewSet):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
-    permission_classes = [IsAuthenticated]
+    action_permissions = {
+        **dict.fromkeys(OBJECT_WRITE_ACTIONS, [IsAuthenticated(), IsBookingOwner()]),
+        'default': [IsAuthenticated()],
+    }
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BookingListSerializer
+        return BookingSerializer
 
     def perform_create(self, serializer):
         """
@@ -187,12 +287,18 @@ class BookingViewSet(viewsets.ModelViewSet):
         nights = (end_date - start_date).days
         total_price = nights * property_obj.price_per_night
 
-        # Save booking with calculated price + user from request
-        booking = serializer.save(user=self.request.user, total_price=total_price)
+        with transaction.atomic():
+            # Save booking with calculated price + user from request
+            booking = serializer.save(user=self.request.user, total_price=total_price)
 
-        # Trigger Celery task
-        send_booking_confirmation_email.delay(str(booking.booking_id), booking.user.email)
-        print(f"DEBUG: Booking confirmation email task for booking {booking.booking_id} triggered via Celery.")
+            # Trigger Celery task
+            # The booking's property and user are already in memory, so the task gets the
+            # email context directly instead of re-reading the booking. The task is queued
+            # only once the booking is committed, so a rollback never sends an email.
+            ctx = booking_confirmation_context(booking)
+            recipient_email = booking.user.email
+            transaction.on_commit(lambda: send_booking_confirmation_email.delay(ctx, recipient_email))
+        logger.debug("Booking confirmation email task for booking %s queued via Celery.", booking.booking_id)
 
     def get_queryset(self):
         """
@@ -200,16 +306,22 @@ class BookingViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         if user.is_authenticated:
-            return Booking.objects.filter(Q(user=user) | Q(property__host=user)).distinct()
+            queryset = super().get_queryset()
+            if self.action == 'list':
+                # Two index lookups merged by UNION instead of DISTINCT over an OR'd join.
+                # Each side drops Meta.ordering with order_by(): ORDER BY isn't allowed inside
+                # compound subqueries on SQLite, and elsewhere it only adds sorts; the combined
+                # queryset is ordered once at the end.
+                # The combined queryset can't be filtered further, so detail routes use the Q form.
+                # List rows are plain dicts for BookingListSerializer, not model instances.
+                fields = BookingListSerializer.values_fields
+                return queryset.filter(user=user).order_by().values(*fields).union(
+                    queryset.filter(property__host=user).order_by().values(*fields)
+                ).order_by('-created_at')
+            # Both lookups follow forward foreign keys, so the join can't duplicate rows.
+            return queryset.filter(Q(user=user) | Q(property__host=user))
         return Booking.objects.none()
 
-    def get_permissions(self):
-        if self.action in ['update', 'partial_update', 'destroy']:
-            self.permission_classes = [IsAuthenticated, IsBookingOwner]
-        else:
-            self.permission_classes = [IsAuthenticated]
-        return [permission() for permission in self.permission_classes]
-
 
 @extend_schema(
     tags=["Payments"],
@@ -228,7 +340,8 @@ class BookingViewSet(viewsets.ModelViewSet):
                             "booking_id": "a1b2c3d4-e5f6-7890-1234-567890abcdef",
                             "start_date": "2025-08-01",
                             "end_date": "2025-08-05",
-                            "total_price": "800.00"
+                            "total_price": "800.00",
+                            "status": "confirmed"
                         },
                         "amount": "400.00",
                         "payment_date": "2025-08-01T10:00:00Z",
@@ -243,26 +356,32 @@ class BookingViewSet(viewsets.ModelViewSet):
         )
     }
 )
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ActionPermissionsMixin, SerializerSelectRelatedMixin, viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
-    permission_classes = [IsAuthenticated]
+    action_permissions = {
+        **dict.fromkeys(OBJECT_WRITE_ACTIONS, [IsAuthenticated(), IsAdminUser()]),
+        'default': [IsAuthenticated()],
+    }
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PaymentListSerializer
+        return PaymentSerializer
 
     def get_queryset(self):
         user = self.request.user
         if user.is_authenticated:
-            return Payment.objects.filter(Q(booking__user=user) | Q(booking__property__host=user)).distinct()
+            queryset = super().get_queryset()
+            if self.action == 'list':
+                # See BookingViewSet.get_queryset.
+                fields = PaymentListSerializer.values_fields
+                return queryset.filter(booking__user=user).order_by().values(*fields).union(
+                    queryset.filter(booking__property__host=user).order_by().values(*fields)
+                ).order_by('-payment_date')
+            return queryset.filter(Q(booking__user=user) | Q(booking__property__host=user))
         return Payment.objects.none()
 
-    def get_permissions(self):
-        if self.action == 'create':
-            self.permission_classes = [IsAuthenticated]
-        elif self.action in ['update', 'partial_update', 'destroy']:
-            self.permission_classes = [IsAuthenticated, IsAdminUser]
-        else:
-            self.permission_classes = [IsAuthenticated]
-        return [permission() for permission in self.permission_classes]
-
 
 @extend_schema(
     tags=["Reviews"],
@@ -299,21 +418,17 @@ class PaymentViewSet(viewsets.ModelViewSet):
         )
     }
 )
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ActionPermissionsMixin, SerializerSelectRelatedMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    action_permissions = {
+        **dict.fromkeys(OBJECT_WRITE_ACTIONS, [IsAuthenticated(), IsReviewOwner()]),
+        'default': [IsAuthenticatedOrReadOnly()],
+    }
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    def get_permissions(self):
-        if self.action in ['update', 'partial_update', 'destroy']:
-            self.permission_classes = [IsAuthenticated, IsReviewOwner]
-        else:
-            self.permission_classes = [IsAuthenticatedOrReadOnly]
-        return [permission() for permission in self.permission_classes]
-
 
 @extend_schema(
     tags=["Messages"],
@@ -367,10 +482,13 @@ class ReviewViewSet(viewsets.ModelViewSet):
         )
     }
 )
-class MessageViewSet(viewsets.ModelViewSet):
+class MessageViewSet(ActionPermissionsMixin, SerializerSelectRelatedMixin, viewsets.ModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
-    permission_classes = [IsAuthenticated]
+    action_permissions = {
+        **dict.fromkeys(OBJECT_WRITE_ACTIONS, [IsAuthenticated(), IsMessageSender()]),
+        'default': [IsAuthenticated()],
+    }
 
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
@@ -378,16 +496,15 @@ class MessageViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.is_authenticated:
-            return Message.objects.filter(Q(sender=user) | Q(recipient=user)).distinct()
+            queryset = super().get_queryset()
+            if self.action == 'list':
+                # See BookingViewSet.get_queryset.
+                return queryset.filter(sender=user).order_by().union(
+                    queryset.filter(recipient=user).order_by()
+                ).order_by('sent_at')
+            return queryset.filter(Q(sender=user) | Q(recipient=user))
         return Message.objects.none()
 
-    def get_permissions(self):
-        if self.action in ['update', 'partial_update', 'destroy']:
-            self.permission_classes = [IsAuthenticated, IsMessageSender]
-        else:
-            self.permission_classes = [IsAuthenticated]
-        return [permission() for permission in self.permission_classes]
-
 
 # --- Chapa Payment Integration Views ---
 
@@ -416,6 +533,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         ),
         400: OpenApiResponse(description="Invalid request data or booking not found."),
         401: OpenApiResponse(description="Authentication credentials were not provided."),
+        409: OpenApiResponse(description="A payment initiation for this booking is already in progress."),
         500: OpenApiResponse(description="Internal server error or Chapa API connectivity issue.")
     }
 )
@@ -433,91 +551,130 @@ def initiate_chapa_payment(request):
             if not booking_id or not amount:
                 return JsonResponse({'error': 'Booking ID and amount are required.'}, status=400)
             
-            # Retrieve the booking to get user details and validate amount
-            try:
-                booking = Booking.objects.get(booking_id=booking_id, user=request.user)
-                # You might want to enforce that amount == booking.total_price here
-                if float(amount) != float(booking.total_price):
-                    # Consider if partial payments are allowed or if this is a strict mismatch
-                    return JsonResponse({'error': f'Amount {amount} does not match booking total price {booking.total_price}.'}, status=400)
-
-            except Booking.DoesNotExist:
-                return JsonResponse({'error': 'Booking not found or you do not own this booking.'}, status=404)
-
-            # Generate a unique transaction reference for Chapa.
-            # It's crucial this is unique for each payment attempt and can be mapped back to your system.
-            # Using UUID for high uniqueness.
-            tx_ref = f"{booking.booking_id.hex}-{uuid.uuid4().hex}"
-
-            # Create a pending payment record BEFORE calling Chapa
-            # This links our internal record to the upcoming Chapa transaction
-            # and helps track failed initiations.
-            payment = Payment.objects.create(
-                booking=booking,
-                amount=amount,
-                payment_method=Payment.PaymentMethodChoices.CHAPA, # Set as Chapa
-                chapa_transaction_id=tx_ref, # Use our tx_ref as Chapa's ID initially, will be updated later
-                status=Payment.ChapaPaymentStatusChoices.PENDING,
-                chapa_status_text='Initiation pending'
-            )
-
-            headers = {
-                "Authorization": f"Bearer {settings.CHAPA_SECRET_KEY}",
-                "Content-Type": "application/json"
-            }
+            # The duplicate check and the insert run under a lock on the booking row, so two
+            # concurrent "Pay" clicks for the same booking can't both create a payment.
+            with transaction.atomic():
+                # Retrieve the booking to get user details and validate amount
+                try:
+                    # One narrow query for the ownership check and the price. The payer is the
+                    # authenticated user, already loaded for this request, so no user join is needed.
+                    booking = Booking.objects.select_for_update().only(
+                        'booking_id', 'total_price',
+                    ).get(booking_id=booking_id, user=request.user)
+                    # Compare as Decimal; float conversion can reject an exact amount.
+                    try:
+                        amount_matches = Decimal(str(amount)) == booking.total_price
+                    except InvalidOperation:
+                        return JsonResponse({'error': f'Invalid amount {amount}.'}, status=400)
+                    if not amount_matches:
+                        # Consider if partial payments are allowed or if this is a strict mismatch
+                        return JsonResponse({'error': f'Amount {amount} does not match booking total price {booking.total_price}.'}, status=400)
+
+                except Booking.DoesNotExist:
+                    return JsonResponse({'error': 'Booking not found or you do not own this booking.'}, status=404)
+
+                now = timezone.now()
+                pending = Payment.objects.filter(
+                    booking_id=booking.booking_id,
+                    status=Payment.ChapaPaymentStatusChoices.PENDING,
+                )
+                # A pending row that never got a checkout URL within the initiation timeout
+                # was abandoned mid-call (e.g. the process died); close it out.
+                pending.filter(
+                    checkout_url__isnull=True,
+                    payment_date__lt=now - CHAPA_INITIATION_TIMEOUT,
+                ).update(
+                    status=Payment.ChapaPaymentStatusChoices.FAILED,
+                    chapa_status_text='Initiation abandoned',
+                )
+
+                # A repeated "Pay" click reuses a recent pending checkout instead of creating a
+                # second payment row and Chapa session for the same booking.
+                existing = pending.filter(
+                    payment_date__gte=now - CHAPA_CHECKOUT_REUSE_WINDOW,
+                ).values_list('chapa_transaction_id', 'checkout_url').first()
+                if existing:
+                    existing_tx_ref, existing_checkout_url = existing
+                    if existing_checkout_url is None:
+                        # Another request is still waiting on Chapa for this booking.
+                        return JsonResponse(
+                            {'status': 'error', 'message': 'Payment initiation already in progress.', 'tx_ref': existing_tx_ref},
+                            status=409,
+                        )
+                    return JsonResponse({'status': 'success', 'checkout_url': existing_checkout_url, 'tx_ref': existing_tx_ref})
+
+                # Generate a unique transaction reference for Chapa.
+                # It's crucial this is unique for each payment attempt and can be mapped back to your system.
+                # Using UUID for high uniqueness.
+                tx_ref = f"{booking.booking_id.hex}-{uuid.uuid4().hex}"
+
+                # Create a pending payment record BEFORE calling Chapa
+                # This links our internal record to the upcoming Chapa transaction
+                # and helps track failed initiations.
+                payment = Payment.objects.create(
+                    booking=booking,
+                    amount=amount,
+                    payment_method=Payment.PaymentMethodChoices.CHAPA, # Set as Chapa
+                    chapa_transaction_id=tx_ref, # Use our tx_ref as Chapa's ID initially, will be updated later
+                    status=Payment.ChapaPaymentStatusChoices.PENDING,
+                    chapa_status_text='Initiation pending'
+                )
+            # The lock is released here; the Chapa call below runs outside the transaction.
+
             payload = {
+                **CHAPA_PAYLOAD_TEMPLATE,
                 "amount": str(amount), # Chapa expects amount as string
-                "currency": "ETB", # Or dynamic if you support other currencies
-                "email": booking.user.email,
-                "first_name": booking.user.first_name,
-                "last_name": booking.user.last_name,
+                "email": request.user.email,
+                "first_name": request.user.first_name,
+                "last_name": request.user.last_name,
                 "tx_ref": tx_ref, # Your unique transaction reference
                 "callback_url": request.build_absolute_uri(f'/api/payments/chapa/verify/{tx_ref}/'),
                 "return_url": request.build_absolute_uri('/payment-status/'), # A generic landing page after Chapa redirect
                 "customization": {
-                    "title": "Travel Booking Payment",
+                    "title": CHAPA_CUSTOMIZATION_TITLE,
                     "description": f"Payment for booking {booking.booking_id}"
                 }
             }
             
-            print(f"DEBUG: Initiating Chapa payment for tx_ref: {tx_ref} with payload: {payload}")
-            chapa_response = requests.post(CHAPA_INITIATE_URL, headers=headers, json=payload)
+            logger.debug("Initiating Chapa payment for tx_ref: %s with payload: %s", tx_ref, payload)
+            chapa_response = CHAPA_SESSION.post(CHAPA_INITIATE_URL, json=payload, timeout=CHAPA_TIMEOUT)
             chapa_response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
             
             response_data = chapa_response.json()
-            print(f"DEBUG: Chapa initiation response: {response_data}")
+            logger.debug("Chapa initiation response: %s", response_data)
 
             if response_data.get('status') == 'success':
                 checkout_url = response_data['data']['checkout_url']
                 # Chapa's `transaction_id` might be different from `tx_ref` but `tx_ref` is what we use to verify
                 # payment.chapa_transaction_id = response_data['data'].get('transaction_id', tx_ref) # Update with Chapa's official transaction_id if provided
                 payment.chapa_status_text = response_data.get('message', 'Payment initiation successful, awaiting completion.')
-                payment.save()
+                payment.checkout_url = checkout_url
+                payment.save(update_fields=['chapa_status_text', 'checkout_url'])
 
                 return JsonResponse({'status': 'success', 'checkout_url': checkout_url, 'tx_ref': tx_ref})
             else:
                 payment.status = Payment.ChapaPaymentStatusChoices.FAILED
                 payment.chapa_status_text = response_data.get('message', 'Failed to initiate payment with Chapa.')
-                payment.save()
+                payment.save(update_fields=['status', 'chapa_status_text'])
                 return JsonResponse({'status': 'error', 'message': payment.chapa_status_text}, status=400)
 
         except json.JSONDecodeError:
             return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
         except requests.exceptions.RequestException as e:
             # Handle network errors or API call failures
-            print(f"ERROR: Chapa API request failed during initiation: {e}")
+            logger.error("Chapa API request failed during initiation: %s", e)
             # Mark payment as failed due to API issue
             if 'payment' in locals() and payment.status == Payment.ChapaPaymentStatusChoices.PENDING:
                 payment.status = Payment.ChapaPaymentStatusChoices.FAILED
                 payment.chapa_status_text = f"API Request Error: {e}"
-                payment.save()
+                payment.save(update_fields=['status', 'chapa_status_text'])
             return JsonResponse({'status': 'error', 'message': 'Could not connect to payment gateway or API error.'}, status=500)
         except Exception as e:
-            print(f"ERROR: An unexpected error occurred during payment initiation: {e}")
+            logger.exception("An unexpected error occurred during payment initiation: %s", e)
             if 'payment' in locals() and payment.status == Payment.ChapaPaymentStatusChoices.PENDING:
                 payment.status = Payment.ChapaPaymentStatusChoices.FAILED
                 payment.chapa_status_text = f"Internal Error: {e}"
-                payment.save()
+                payment.save(update_fields=['status', 'chapa_status_text'])
             return JsonResponse({'status': 'error', 'message': f'An internal error occurred: {e}'}, status=500)
     return JsonResponse({'error': 'Invalid request method. Only POST is allowed.'}, status=405)
 
@@ -525,7 +682,7 @@ def initiate_chapa_payment(request):
 @extend_schema(
     tags=["Chapa Payments"],
     summary="Verify a Chapa payment status via callback",
-    description="This endpoint is called by Chapa (or by your frontend after redirection) to verify the final status of a payment. It queries Chapa's API and updates the payment record accordingly. Triggers confirmation email on success.",
+    description="This endpoint is called by Chapa (or by your frontend after redirection) to verify the final status of a payment. Verification against Chapa's API runs in a background task, which updates the payment record and triggers the confirmation email on success.",
     parameters=[
         OpenApiParameter(
             name='tx_ref',
@@ -556,74 +713,46 @@ def verify_chapa_payment(request, tx_ref):
     # This endpoint is accessed when Chapa redirects the user back to your site.
     # It should ideally be idempotent: multiple calls for the same tx_ref should not cause issues.
     
-    try:
-        payment = get_object_or_404(Payment, chapa_transaction_id=tx_ref)
-
-        # IMPORTANT: Avoid re-processing if already completed or failed
-        if payment.status in [Payment.ChapaPaymentStatusChoices.COMPLETED, Payment.ChapaPaymentStatusChoices.FAILED]:
-            print(f"DEBUG: Payment {tx_ref} already processed with status: {payment.status}. Skipping re-verification.")
-            # Redirect to a status page that shows the current status
-            return HttpResponseRedirect(f'/payment-status/?tx_ref={tx_ref}&status={payment.status.lower()}')
-
-        headers = {
-            "Authorization": f"Bearer {settings.CHAPA_SECRET_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        print(f"DEBUG: Verifying Chapa payment for tx_ref: {tx_ref}")
-        chapa_response = requests.get(f"{CHAPA_VERIFY_URL}{tx_ref}", headers=headers)
-        chapa_response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-        
-        response_data = chapa_response.json()
-        print(f"DEBUG: Chapa verification response: {response_data}")
-
-        # Chapa's verification response structure:
-        # { "status": "success", "message": "Payment details", "data": { ... payment info ... "status": "success", ... } }
-        if response_data.get('status') == 'success' and response_data['data'].get('status') == 'success':
-            payment.status = Payment.ChapaPaymentStatusChoices.COMPLETED
-            payment.chapa_status_text = response_data['data'].get('status', 'Payment completed successfully.')
-            payment.save()
-
-            # Update booking status if payment is successful
-            if payment.booking.status != Booking.BookingStatusChoices.CONFIRMED:
-                payment.booking.status = Booking.BookingStatusChoices.CONFIRMED
-                payment.booking.save()
-                print(f"DEBUG: Booking {payment.booking.booking_id} status updated to CONFIRMED.")
-
-            # Trigger email sending in background using Celery
-            # Get the actual email from the associated booking's user
-            recipient_email = payment.booking.user.email
-            send_payment_confirmation_email.delay(str(payment.payment_id), recipient_email, payment.amount, str(payment.booking.booking_id))
-            print(f"DEBUG: Payment confirmation email task for payment {payment.payment_id} triggered via Celery.")
-
-            # Redirect user to a success page
-            return HttpResponseRedirect('/payment-success/')
-        else:
-            # Payment failed or is not successful from Chapa's perspective
-            payment.status = Payment.ChapaPaymentStatusChoices.FAILED
-            # Try to get a more specific message from 'data' first, then from top-level 'message'
-            payment.chapa_status_text = response_data['data'].get('message', response_data.get('message', 'Payment verification failed.'))
-            payment.save()
-            print(f"DEBUG: Payment {tx_ref} failed. Status: {payment.chapa_status_text}")
-            # Redirect user to a failure page, possibly with error details
-            return HttpResponseRedirect(f'/payment-fail/?tx_ref={tx_ref}&status={payment.chapa_status_text}')
-
-    except Payment.DoesNotExist:
-        print(f"ERROR: Payment record not found for tx_ref: {tx_ref}")
-        return JsonResponse({'status': 'error', 'message': 'Payment record not found.'}, status=404)
-    except requests.exceptions.RequestException as e:
-        print(f"ERROR: Chapa API verification failed for tx_ref {tx_ref}: {e}")
-        # If payment exists and is pending, mark it as failed due to verification API error
-        if 'payment' in locals() and payment.status == Payment.ChapaPaymentStatusChoices.PENDING:
-            payment.status = Payment.ChapaPaymentStatusChoices.FAILED
-            payment.chapa_status_text = f"API Verification Error: {e}"
-            payment.save()
-        return HttpResponseRedirect(f'/payment-fail/?tx_ref={tx_ref}&error=api_error')
-    except Exception as e:
-        print(f"ERROR: An unexpected error occurred during payment verification for tx_ref {tx_ref}: {e}")
-        # Mark payment as failed due to internal error if still pending
-        if 'payment' in locals() and payment.status == Payment.ChapaPaymentStatusChoices.PENDING:
-            payment.status = Payment.ChapaPaymentStatusChoices.FAILED
-            payment.chapa_status_text = f"Internal Error: {e}"
-            payment.save()
-        return HttpResponseRedirect(f'/payment-fail/?tx_ref={tx_ref}&error=internal_error')
\ No newline at end of file
+    # Chapa calls back and the browser returns for the same tx_ref; once the task has
+    # recorded a final status, repeat hits are answered from the cache.
+    tx_status = cache.get(tx_status_cache_key(tx_ref))
+    if tx_status is None:
+        # Only the status is needed here; the Chapa round trip happens in a Celery task.
+        tx_status = Payment.objects.filter(chapa_transaction_id=tx_ref).values_list('status', flat=True).first()
+        if tx_status is None:
+            logger.error("Payment record not found for tx_ref: %s", tx_ref)
+            return JsonResponse({'status': 'error', 'message': 'Payment record not found.'}, status=404)
+
+    # IMPORTANT: Avoid re-processing if already completed or failed
+    if tx_status == Payment.ChapaPaymentStatusChoices.COMPLETED:
+        return HttpResponseRedirect('/payment-success/')
+    if tx_status == Payment.ChapaPaymentStatusChoices.FAILED:
+        return HttpResponseRedirect(f'/payment-fail/?tx_ref={tx_ref}&status={tx_status.lower()}')
+
+    verify_chapa_payment_task.delay(tx_ref)
+    return HttpResponseRedirect(f'/payment-status/?tx_ref={tx_ref}&status=pending')
+
+
+# --- Payment Status Placeholder Views ---
+# Simple placeholder pages for the Chapa redirects. The bodies never change, so they
+# are serialized once at import instead of building a JsonResponse per request.
+PAYMENT_SUCCESS_BODY = b'{"message": "Payment successful!"}'
+PAYMENT_FAIL_BODY = b'{"message": "Payment failed!"}'
+PAYMENT_STATUS_BODY = b'{"message": "Payment status check."}'
+
+
+@require_GET
+@cache_control(max_age=3600)
+def payment_success(request):
+    return HttpResponse(PAYMENT_SUCCESS_BODY, content_type='application/json')
+
+
+@require_GET
+@cache_control(max_age=3600)
+def payment_fail(request):
+    return HttpResponse(PAYMENT_FAIL_BODY, content_type='application/json')
+
+
+@require_GET
+def payment_status(request):
+    return HttpResponse(PAYMENT_STATUS_BODY, content_type='application/json')